@@ -1,41 +1,55 @@
 import sys
 import os
+import collections
+import functools
+import itertools
+import math
+import queue
+import threading
 import cv2
 import subprocess
-import pandas as pd
 import numpy as np
 import pyqtgraph as pg
-import pyqtgraph.exporters
 from PyQt5 import QtWidgets, QtCore, QtGui
 import qtawesome as qta
-from scipy.signal import savgol_filter
+
+# pandas and scipy are imported where they are used: neither is needed to bring up the window
 
 # ─── Data Loaders ───────────────────────────────────────────────────────────────
 
 class Sports2DLoader:
     @staticmethod
     def load_trc(filepath):
+        import pandas as pd
         try:
+            # Only the first 4 header lines are needed; the body goes straight to pandas
             with open(filepath, 'r') as f:
-                lines = f.readlines()
-            header_vals = lines[2].split()
+                header = list(itertools.islice(f, 4))
+            header_vals = header[2].split()
             data_rate = float(header_vals[0])
             num_frames = int(header_vals[2])
-            marker_names_raw = lines[3].split('\t')
+            marker_names_raw = header[3].split('\t')
             marker_names = [n.strip() for n in marker_names_raw if n.strip() and n.strip() not in ['Frame#', 'Time']]
-            data = pd.read_csv(filepath, sep='\t', skiprows=5, header=None)
+            # NaN parsing stays on: Sports2D writes 'nan' for missing keypoints
+            data = pd.read_csv(filepath, sep='\t', skiprows=5, header=None, engine='c',
+                               dtype=np.float32, memory_map=True, low_memory=False)
+            arr = data.to_numpy()
+            n_markers = len(marker_names)
+            # (n_frames, n_markers, 3) view over the X/Y/Z columns, no per-column copies
+            xyz = arr[:, 2:2 + 3 * n_markers].reshape(-1, n_markers, 3)
+            # Frame-major SoA block: coords[frame, joint_idx[name]] = (x, y)
+            coords = np.ascontiguousarray(xyz[:, :, :2], dtype=np.float32)
+            # Per-name dict views over `coords`, kept for code that works marker by marker
             markers_data = {}
             for i, name in enumerate(marker_names):
-                x_col = i * 3 + 2
-                y_col = i * 3 + 3
-                markers_data[name] = {
-                    'x': data.iloc[:, x_col].values.astype(float),
-                    'y': data.iloc[:, y_col].values.astype(float)
-                }
+                markers_data[name] = {'x': coords[:, i, 0], 'y': coords[:, i, 1]}
             return {
                 'frame_count': num_frames, 'data_rate': data_rate,
                 'markers': markers_data, 'marker_list': marker_names,
-                'time': data.iloc[:, 1].values.astype(float)
+                'coords': coords, 'joint_idx': {n: i for i, n in enumerate(marker_names)},
+                # Pixel positions for drawing, truncated like int(); NaN becomes -1
+                'coords_i32': np.nan_to_num(coords, nan=-1).astype(np.int32),
+                'time': arr[:, 1]
             }
         except Exception as e:
             print(f"Error loading TRC: {e}")
@@ -43,22 +57,23 @@ class Sports2DLoader:
 
     @staticmethod
     def load_mot(filepath):
+        import pandas as pd
         try:
-            with open(filepath, 'r') as f:
-                lines = f.readlines()
+            # Only scan up to the header; pandas memory-maps the file for the body
             start_row = 0
-            for i, line in enumerate(lines):
-                if 'endheader' in line:
-                    start_row = i + 1
-                    break
-            data = pd.read_csv(filepath, sep='\t', skiprows=start_row)
-            headers = list(data.columns)
-            angles_data = {}
-            for header in headers[1:]:
-                angles_data[header] = data[header].values.astype(float)
+            with open(filepath, 'r') as f:
+                for i, line in enumerate(f):
+                    if 'endheader' in line:
+                        start_row = i + 1
+                        break
+            data = pd.read_csv(filepath, sep='\t', skiprows=start_row, engine='c',
+                               dtype=np.float32, memory_map=True, low_memory=False)
+            headers = data.columns.tolist()
+            arr = data.to_numpy()
+            angles_data = {h: arr[:, j + 1] for j, h in enumerate(headers[1:])}
             return {
                 'angles': angles_data, 'angle_list': headers[1:],
-                'time': data[headers[0]].values.astype(float)
+                'time': arr[:, 0]
             }
         except Exception as e:
             print(f"Error loading MOT: {e}")
@@ -78,10 +93,247 @@ MARKER_TO_ANGLE = {
     'Hip': 'pelvis', 'Neck': 'trunk', 'Head': 'head', 'Nose': 'head',
 }
 
+@functools.lru_cache(maxsize=None)
+def _sg_kernels(win, poly):
+    """Savitzky-Golay taps for `win`/`poly` plus the fit rows used at the edges."""
+    from scipy.signal import savgol_coeffs
+    conv = savgol_coeffs(win, poly)
+    fit = np.array([savgol_coeffs(win, poly, pos=p, use='dot') for p in range(win)])
+    return conv, fit
+
 def smooth(arr, win=11, poly=3):
-    if len(arr) > win:
-        return savgol_filter(arr, win, poly)
-    return arr
+    return smooth_matrix(arr, win, poly)
+
+def smooth_matrix(arr2d, win=11, poly=3, axis=0):
+    """Savitzky-Golay smooth every signal of a stacked matrix in one call."""
+    if arr2d.shape[axis] <= win:
+        return arr2d
+    from scipy.ndimage import convolve1d
+    conv, fit = _sg_kernels(win, poly)
+    out = convolve1d(arr2d, conv, axis=axis, mode='constant')
+    # Edges: evaluate the polynomial fitted to the first/last window (savgol 'interp' mode)
+    half = win // 2
+    src = np.moveaxis(arr2d, axis, -1)
+    dst = np.moveaxis(out, axis, -1)
+    dst[..., :half] = src[..., :win] @ fit[:half].T
+    dst[..., -half:] = src[..., -win:] @ fit[win - half:].T
+    return out
+
+def time_gradient(a, dt, axis=-1):
+    """np.gradient along `axis`, second order at the edges when there are enough samples.
+
+    Two frames fall back to first-order edges; fewer than two have no derivative (zeros).
+    """
+    n = a.shape[axis]
+    if n < 2:
+        return np.zeros_like(a)
+    return np.gradient(a, dt, axis=axis, edge_order=2 if n >= 3 else 1)
+
+def smoothed_derivative(P, dt):
+    """Smoothed d/dt of a stacked (2, ..., n_frames) x/y block, with its magnitude as a third row."""
+    d = np.empty((3,) + P.shape[1:], dtype=P.dtype)
+    # One gradient call covers x and y; the three rows are then smoothed together
+    d[:2] = time_gradient(P, dt)
+    np.hypot(d[0], d[1], out=d[2])
+    return smooth_matrix(d, axis=-1)
+
+def marker_kinematics(X, Y, dt):
+    """Smoothed velocity/acceleration for stacked (n_markers, n_frames) positions."""
+    VX, VY, V = v = smoothed_derivative(np.stack([X, Y]), dt)
+    AX, AY, A = smoothed_derivative(v[:2], dt)
+    return {'x': X, 'y': Y, 'vx': VX, 'vy': VY, 'vtotal': V,
+            'ax': AX, 'ay': AY, 'atotal': A}
+
+# ─── Video capture ────────────────────────────────────────────────────────────
+
+# Forward jumps shorter than this are decoded in order instead of seeking to a keyframe
+SEEK_GRAB_LIMIT = 30
+
+def open_capture(path):
+    """Open `path` with the FFmpeg backend, falling back to OpenCV's default.
+
+    Hardware decoding is requested when available; FFmpeg silently stays on
+    the software decoder otherwise. A freshly opened capture sits before
+    frame 0, i.e. its last frame is -1.
+    """
+    cap = cv2.VideoCapture(path, cv2.CAP_FFMPEG,
+                           [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+    if not cap.isOpened():
+        cap = cv2.VideoCapture(path, cv2.CAP_FFMPEG)
+    if not cap.isOpened():
+        cap = cv2.VideoCapture(path)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+def read_frame(cap, last, idx, buf=None):
+    """Read frame `idx` from `cap`, whose last returned frame was `last` (None if unknown).
+
+    A `buf` of the right shape is decoded into in place instead of allocating a new frame.
+    """
+    if last is not None and 0 < idx - last < SEEK_GRAB_LIMIT:
+        # grab() skips without converting pixels; retrieve() decodes only the target
+        ok = all(cap.grab() for _ in range(idx - last))
+        return cap.retrieve(buf) if ok else (False, None)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+    return cap.read(buf)
+
+# ─── Frame conversion ─────────────────────────────────────────────────────────
+
+# Only CUDA builds of OpenCV (not the pip wheels) report a device here
+HAVE_CUDA = hasattr(cv2, 'cuda') and cv2.cuda.getCudaEnabledDeviceCount() > 0
+
+def fit_size(w, h, lw, lh):
+    """Largest (sw, sh) with the aspect ratio of a w x h frame that fits an lw x lh label."""
+    ia = w / h
+    if ia > lw / lh:
+        return lw, max(1, int(lw / ia))
+    return max(1, int(lh * ia)), lh
+
+def frame_to_rgb(frame, size, out=None, fast=False):
+    """Resize a BGR frame to `size` (w, h) and convert it to RGB for display.
+
+    On the CPU path the result is written into `out` (uint8, h x w x 3) when given.
+    `fast` keeps bilinear filtering when downscaling, for playback.
+    """
+    # INTER_AREA anti-aliases downscaling but costs several times INTER_LINEAR
+    interp = cv2.INTER_AREA if size[0] < frame.shape[1] and not fast else cv2.INTER_LINEAR
+    if HAVE_CUDA:
+        # Upload once, download only the display-sized RGB frame
+        gpu = cv2.cuda_GpuMat()
+        gpu.upload(frame)
+        small = cv2.cuda.resize(gpu, size, interpolation=interp)
+        return cv2.cuda.cvtColor(small, cv2.COLOR_BGR2RGB).download()
+    # With OpenCL enabled (see __main__), UMat routes both calls through the GPU
+    if cv2.ocl.useOpenCL():
+        small = cv2.resize(cv2.UMat(frame), size, interpolation=interp)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2RGB).get()
+    small = cv2.resize(frame, size, interpolation=interp)
+    return cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=out)
+
+# ─── Overlay drawing ──────────────────────────────────────────────────────────
+
+TRAIL_LEN = 60  # frames of trajectory drawn behind the selected joint
+
+@functools.lru_cache(maxsize=None)
+def trail_colors(trail_len):
+    """BGR colour of each segment of a `trail_len` trail, fading in towards the current frame."""
+    return tuple((255 * k // max(trail_len, 1), 200, 80) for k in range(trail_len))
+
+@functools.lru_cache(maxsize=None)
+def label_tile(text, font, scale, color):
+    """`text` rasterized once as (colour tile, alpha, 1 - alpha, text origin in the tile)."""
+    (tw, th), base = cv2.getTextSize(text, font, scale, 1)
+    org = (2, th + 2)  # 2 px margin for the anti-aliased edges
+    mask = np.zeros((th + base + 4, tw + 4), dtype=np.uint8)
+    cv2.putText(mask, text, org, font, scale, 255, 1, cv2.LINE_AA)
+    alpha = mask.astype(np.float32) / 255
+    tile = np.empty(mask.shape + (3,), dtype=np.uint8)
+    tile[:] = color
+    return tile, alpha, 1 - alpha, org
+
+def blit_label(frame, tile, org):
+    """Blend a label_tile onto `frame` in place with its text origin at `org`, clipped to the frame."""
+    img, a, b, (ox, oy) = tile
+    x0, y0 = org[0] - ox, org[1] - oy
+    fx0, fy0 = max(x0, 0), max(y0, 0)
+    fx1, fy1 = min(x0 + a.shape[1], frame.shape[1]), min(y0 + a.shape[0], frame.shape[0])
+    if fx0 >= fx1 or fy0 >= fy1:
+        return
+    t = np.s_[fy0 - y0:fy1 - y0, fx0 - x0:fx1 - x0]
+    roi = frame[fy0:fy1, fx0:fx1]
+    cv2.blendLinear(img[t], roi, a[t], b[t], dst=roi)
+
+def on_frame(segs, w, h, pad=2):
+    """Mask of (n, 2, 2) segments that may touch a w x h frame.
+
+    A segment is dropped only when both ends lie beyond the same edge (by more than
+    `pad`, which covers the line width); segments crossing the frame are kept.
+    """
+    x, y = segs[..., 0], segs[..., 1]
+    return ~((x < -pad).all(1) | (x >= w + pad).all(1) | (y < -pad).all(1) | (y >= h + pad).all(1))
+
+def draw_overlays(frame, idx, ov):
+    """Draw trajectories, skeleton and joints for frame `idx` onto `frame` in place.
+
+    `ov` is the snapshot from Sports2DApp._overlay_state (None without a TRC); it only
+    holds arrays that are replaced, never mutated, so the decoder thread can use it.
+    """
+    if ov is None:
+        return frame
+    coords, coords_i32 = ov['coords'], ov['coords_i32']
+    mi = ov['joint_idx']
+    n_frames = len(coords)
+    fh, fw = frame.shape[:2]
+    selected, angle = ov['selected'], ov['angle']
+    CLR_BONE = (180, 180, 180)
+    CLR_DOT = (255, 255, 255)
+    CLR_SEL = (80, 255, 80)
+
+    # Trajectory: segment k joins frames i0+k and i0+k+1 of the trail
+    if selected in mi:
+        c = coords[:, mi[selected]]
+        trail_len = min(TRAIL_LEN, idx)
+        i0 = idx - trail_len
+        if ov['show_trajectory']:
+            i1 = min(idx, n_frames - 1) + 1
+            ok = c[i0:i1, 0] > 0  # NaN compares False
+            ok = ok[:-1] & ok[1:]
+            seg = coords_i32[i0:i1, mi[selected]]
+            ends = np.stack([seg[:-1], seg[1:]], axis=1)
+            ok &= on_frame(ends, fw, fh)
+            ends = ends[ok]
+            clrs = itertools.compress(trail_colors(trail_len), ok)
+            for ((x1, y1), (x2, y2)), clr in zip(ends.tolist(), clrs):
+                cv2.line(frame, (x1, y1), (x2, y2), clr, 2, cv2.LINE_AA)
+
+        if ov['show_relative_trajectory'] and 'Hip' in mi and idx < n_frames:
+            h = coords[:, mi['Hip']]
+            if h[idx, 0] > 0:
+                # Replay the joint's path around the hip's current position
+                rel = c[i0:idx + 1] - h[i0:idx + 1] + h[idx]
+                ok = (c[i0:idx + 1, 0] > 0) & (h[i0:idx + 1, 0] > 0)
+                ok = ok[:-1] & ok[1:]
+                segs = np.stack([rel[:-1], rel[1:]], axis=1)[ok].astype(np.int32)
+                # Relative trails can wander well outside the frame
+                segs = segs[on_frame(segs, fw, fh)]
+                if len(segs):
+                    cv2.polylines(frame, list(segs), False, (80, 200, 255), 2, cv2.LINE_AA)
+
+    if idx >= n_frames:
+        return frame
+
+    # One contiguous (n_joints, 2) row serves the skeleton and the dots; the float
+    # row decides validity, the int row supplies pixel positions
+    pts, pts_i = coords[idx], coords_i32[idx]
+
+    # Skeleton: gather both endpoints of every bone at once, (n_bones, 2, 2)
+    bones = ov['bone_idx']
+    valid = (pts[bones, 0] > 0).all(axis=1)  # NaN compares False
+    segs = pts_i[bones[valid]]
+    if len(segs):
+        # Each bone is its own 2-point polyline, so one call draws the skeleton
+        cv2.polylines(frame, list(segs), False, CLR_BONE, 2, cv2.LINE_AA)
+
+    # Dots: one vectorized mask, leaving only the cv2 calls per joint
+    valid = pts[:, 0] > 0  # NaN compares False
+    pts_i = pts_i.tolist()
+    sel = mi.get(selected)
+    for j in np.flatnonzero(valid).tolist():
+        if j != sel:
+            cv2.circle(frame, tuple(pts_i[j]), 4, CLR_DOT, -1, cv2.LINE_AA)
+
+    # Selected joint and its labels, drawn last so they stay on top
+    if sel is not None and valid[sel]:
+        x, y = pts_i[sel]
+        cv2.circle(frame, (x, y), 9, CLR_SEL, -1, cv2.LINE_AA)
+        # Joint names never change, so they are blended from a cached tile
+        blit_label(frame, label_tile(selected, cv2.FONT_HERSHEY_DUPLEX, 0.65, CLR_SEL), (x+14, y-14))
+        if angle is not None and idx < len(angle):
+            ang = angle[idx]
+            if not math.isnan(ang):
+                cv2.putText(frame, f"{ang:.1f} deg", (x+14, y+18),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.55, (80, 200, 255), 1, cv2.LINE_AA)
+    return frame
 
 # ─── Sports2D Analysis Worker (runs in background thread) ──────────────────────
 
@@ -90,11 +342,31 @@ class AnalysisWorker(QtCore.QThread):
     progress = QtCore.pyqtSignal(str)     # status text
     finished = QtCore.pyqtSignal(bool, str)  # success, message
 
+    # Log lines are forwarded in batches to keep cross-thread signal traffic low
+    LOG_BATCH_LINES = 32
+    LOG_BATCH_MS = 50
+
     def __init__(self, video_path, slowmo_factor=1):
         super().__init__()
         self.video_path = video_path
         self.slowmo_factor = slowmo_factor
 
+    @staticmethod
+    def _pump(stream, lines):
+        """Forward every line of `stream` to the `lines` queue, then a None sentinel.
+
+        A read error (e.g. undecodable output) is queued as the exception itself
+        ahead of the sentinel, so run() always sees the stream close.
+        """
+        try:
+            for line in iter(stream.readline, ''):
+                lines.put(line)
+        except Exception as e:
+            lines.put(e)
+        finally:
+            stream.close()
+            lines.put(None)
+
     def run(self):
         try:
             # Find sports2d executable
@@ -117,19 +389,50 @@ class AnalysisWorker(QtCore.QThread):
             process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
+                stderr=subprocess.PIPE,
                 text=True,
+                bufsize=1,
                 cwd=os.path.dirname(self.video_path),
                 creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
             )
 
+            # Drain stdout and stderr on their own threads so neither pipe can fill up and block sports2d
+            lines = queue.Queue()
+            for stream in (process.stdout, process.stderr):
+                threading.Thread(target=self._pump, args=(stream, lines), daemon=True).start()
+
             # Stream output
-            for line in process.stdout:
+            open_streams = 2
+            error = None
+            batch = []
+            clock = QtCore.QElapsedTimer()
+            clock.start()
+            while open_streams:
+                try:
+                    line = lines.get(timeout=self.LOG_BATCH_MS / 1000)
+                except queue.Empty:
+                    line = ''
+                if line is None:
+                    open_streams -= 1
+                    line = ''
+                elif isinstance(line, Exception):
+                    # That pipe is no longer drained; stop sports2d so the other one closes too
+                    error = error or line
+                    process.kill()
+                    line = ''
                 line = line.strip()
                 if line:
-                    self.progress.emit(line)
+                    batch.append(line)
+                if batch and (len(batch) >= self.LOG_BATCH_LINES or clock.elapsed() >= self.LOG_BATCH_MS):
+                    self.progress.emit('\n'.join(batch))
+                    batch = []
+                    clock.restart()
+            if batch:
+                self.progress.emit('\n'.join(batch))
 
             process.wait()
+            if error is not None:
+                raise error
             if process.returncode == 0:
                 self.finished.emit(True, "Analysis completed successfully!")
             else:
@@ -139,6 +442,70 @@ class AnalysisWorker(QtCore.QThread):
         except Exception as e:
             self.finished.emit(False, f"Error: {str(e)}")
 
+# ─── Background frame decoder ─────────────────────────────────────────────────
+
+class FrameDecoder(QtCore.QThread):
+    """Decodes, decorates and converts frames ahead of playback into a small bounded buffer."""
+    BUFFER_SIZE = 8
+
+    def __init__(self, cap, last, start_frame, size, overlay=None):
+        super().__init__()
+        # Borrowed from the GUI, which must not touch it until stop() has returned;
+        # `last` tracks the frame it last returned so the GUI can keep reading in order
+        self.cap = cap
+        self.last = last
+        self.start_frame = start_frame
+        self.size = size          # (w, h) of the produced images
+        self.overlay = overlay    # draw_overlays snapshot taken when playback (re)started
+        self._frames = collections.deque()
+        self._mutex = QtCore.QMutex()
+        self._not_full = QtCore.QWaitCondition()
+        self._running = True
+
+    def run(self):
+        cap = self.cap
+        # The QImages wrap a fixed pool of RGB buffers. A slot comes round again only
+        # after the GUI has popped two newer images, so it is never overwritten while
+        # queued or being converted to a pixmap.
+        pool = [None] * (self.BUFFER_SIZE + 2)
+        sw, sh = self.size
+        idx = self.start_frame
+        ret, frame = read_frame(cap, self.last, idx)
+        self.last = idx if ret else None
+        while ret:
+            draw_overlays(frame, idx, self.overlay)
+            slot = idx % len(pool)
+            rgb = pool[slot] = frame_to_rgb(frame, self.size, out=pool[slot], fast=True)
+            qimg = QtGui.QImage(rgb.data, sw, sh, 3 * sw, QtGui.QImage.Format_RGB888)
+            self._mutex.lock()
+            while self._running and len(self._frames) >= self.BUFFER_SIZE:
+                self._not_full.wait(self._mutex)
+            running = self._running
+            if running:
+                self._frames.append((idx, qimg))
+            self._mutex.unlock()
+            if not running:
+                break
+            idx += 1
+            ret, frame = cap.read(frame)
+            self.last = idx if ret else None
+
+    def pop(self):
+        """Return the next (idx, QImage), or None if none is ready yet."""
+        locker = QtCore.QMutexLocker(self._mutex)
+        if not self._frames:
+            return None
+        item = self._frames.popleft()
+        self._not_full.wakeOne()
+        return item
+
+    def stop(self):
+        self._mutex.lock()
+        self._running = False
+        self._not_full.wakeAll()
+        self._mutex.unlock()
+        self.wait()
+
 # ─── Interactive video label ────────────────────────────────────────────────────
 
 class VideoLabel(QtWidgets.QLabel):
@@ -151,7 +518,17 @@ class VideoLabel(QtWidgets.QLabel):
         self._cal_start = None
         self._cal_end = None
         self._drawing = False
-        self.cal_text = ""  # Text to display on the line
+        self._cal_text = ""  # Text to display on the line
+        self._cal_overlay = None  # Pre-rendered calibration line, blitted in paintEvent
+
+    @property
+    def cal_text(self):
+        return self._cal_text
+
+    @cal_text.setter
+    def cal_text(self, text):
+        self._cal_text = text
+        self._render_cal_overlay()
 
     def mousePressEvent(self, event):
         if event.button() == QtCore.Qt.LeftButton:
@@ -159,6 +536,7 @@ class VideoLabel(QtWidgets.QLabel):
                 self._cal_start = event.pos()
                 self._cal_end = event.pos()
                 self._drawing = True
+                self._render_cal_overlay()
             else:
                 self.clicked.emit(event.pos())
         super().mousePressEvent(event)
@@ -166,21 +544,31 @@ class VideoLabel(QtWidgets.QLabel):
     def mouseMoveEvent(self, event):
         if self._drawing:
             self._cal_end = event.pos()
-            self.update()
+            self._render_cal_overlay()
 
     def mouseReleaseEvent(self, event):
         if self._drawing:
             self._drawing = False
             self._cal_end = event.pos()
-            self.update()
+            self._render_cal_overlay()
             if self._cal_start and self._cal_end:
                 self.calibration_done.emit(self._cal_start, self._cal_end)
             self.draw_mode = False
 
-    def paintEvent(self, event):
-        super().paintEvent(event)
-        if self._cal_start and self._cal_end:
-            painter = QtGui.QPainter(self)
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self._cal_overlay is not None:
+            self._render_cal_overlay()
+
+    def _render_cal_overlay(self):
+        """Draw the calibration line into a transparent pixmap once per change."""
+        self._cal_overlay = None
+        if self._cal_start and self._cal_end and self.width() > 0 and self.height() > 0:
+            dpr = self.devicePixelRatioF()
+            pix = QtGui.QPixmap(self.size() * dpr)
+            pix.setDevicePixelRatio(dpr)
+            pix.fill(QtCore.Qt.transparent)
+            painter = QtGui.QPainter(pix)
             pen = QtGui.QPen(QtGui.QColor('#F9E2AF'), 3, QtCore.Qt.DashLine)
             painter.setPen(pen)
             painter.drawLine(self._cal_start, self._cal_end)
@@ -193,14 +581,91 @@ class VideoLabel(QtWidgets.QLabel):
             font.setBold(True)
             font.setPointSize(11)
             painter.setFont(font)
-            painter.drawText(int(mid.x()) + 10, int(mid.y()) - 10, self.cal_text)
+            painter.drawText(int(mid.x()) + 10, int(mid.y()) - 10, self._cal_text)
+            painter.end()
+            self._cal_overlay = pix
+        self.update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._cal_overlay is not None:
+            painter = QtGui.QPainter(self)
+            painter.drawPixmap(0, 0, self._cal_overlay)
             painter.end()
 
     def clear_cal_line(self):
         self._cal_start = None
         self._cal_end = None
         self.cal_text = ""
-        self.update()
+
+
+# ─── Stylesheets ───────────────────────────────────────────────────────────────
+
+# Applied once to the QApplication in __main__; dialogs are scoped by object name
+_APP_QSS = """
+QMainWindow { background-color: #11111b; }
+QWidget { color: #cdd6f4; font-family: 'Inter', 'Segoe UI', Arial; font-size: 13px; }
+#videoFrame { background-color: #181825; border-radius: 10px; border: 1px solid #313244; }
+#controlBar { background-color: #181825; border-radius: 8px; border: 1px solid #313244; }
+QPushButton { background-color: #313244; border-radius: 6px; padding: 8px 16px; color: white; border: none; }
+QPushButton:hover { background-color: #45475a; }
+QPushButton:pressed { background-color: #585b70; }
+#loadBtn { background-color: #45475a; padding: 10px 16px; }
+#loadBtn:hover { background-color: #585b70; }
+#analyzeBtn { background-color: #A6E3A1; color: #1e1e2e; font-weight: bold; padding: 10px 20px; }
+#analyzeBtn:hover { background-color: #94E298; }
+#calBtn { background-color: #F9E2AF; color: #1e1e2e; font-weight: bold; padding: 10px 16px; }
+#calBtn:hover { background-color: #FAD87D; }
+#exportGraphBtn { background-color: #CBA6F7; color: #1e1e2e; font-weight: bold; padding: 10px 16px; }
+#exportGraphBtn:hover { background-color: #D4B8FA; }
+#exportCsvBtn { background-color: #89B4FA; color: #1e1e2e; font-weight: bold; padding: 10px 16px; }
+#exportCsvBtn:hover { background-color: #9CC3FB; }
+#selHeader { color: #89B4FA; font-size: 16px; font-weight: bold; border: none; }
+#dataCard { background-color: #181825; border-radius: 10px; border: 1px solid #313244; padding: 12px; }
+#coordToggleBtn { background-color: #45475a; border-radius: 6px; padding: 10px; color: #cdd6f4; border: none; font-weight: bold; }
+#coordToggleBtn:hover { background-color: #585b70; }
+#trajBtn { background-color: #45475a; border-radius: 6px; padding: 10px; color: #cdd6f4; border: none; }
+#trajBtn:hover { background-color: #585b70; }
+#relTrajBtn { background-color: #45475a; border-radius: 6px; padding: 10px; color: #cdd6f4; border: none; }
+#relTrajBtn:hover { background-color: #585b70; }
+#graphThemeBtn { background-color: #45475a; border-radius: 6px; padding: 10px; color: #cdd6f4; border: none; font-weight: bold; }
+#graphThemeBtn:hover { background-color: #585b70; }
+#graphScroll { border: none; background: transparent; }
+QScrollBar:vertical { background: #181825; width: 8px; }
+QScrollBar::handle:vertical { background: #45475a; border-radius: 4px; }
+QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { height: 0; }
+QSlider::groove:horizontal { border: none; height: 6px; background: #313244; border-radius: 3px; }
+QSlider::handle:horizontal { background: #4CAF50; border: none; width: 16px; height: 16px; margin: -5px 0; border-radius: 8px; }
+"""
+
+_ANALYSIS_QSS = """
+QDialog#analysisDialog { background-color: #1e1e2e; }
+#analysisDialog QLabel { color: #cdd6f4; font-size: 13px; }
+#analysisDialog QLineEdit, #analysisDialog QSpinBox, #analysisDialog QDoubleSpinBox {
+    background-color: #313244; color: #cdd6f4; border: 1px solid #45475a;
+    border-radius: 6px; padding: 8px; font-size: 13px;
+}
+#analysisDialog QPushButton {
+    background-color: #4CAF50; color: white; border-radius: 6px;
+    padding: 10px 20px; font-weight: bold; font-size: 14px; border: none;
+}
+#analysisDialog QPushButton:hover { background-color: #66BB6A; }
+#analysisDialog QPushButton#cancelBtn { background-color: #45475a; }
+#analysisDialog QPushButton#cancelBtn:hover { background-color: #585b70; }
+"""
+
+_PROGRESS_QSS = """
+QDialog#progressDialog { background-color: #1e1e2e; }
+#progressDialog QLabel { color: #cdd6f4; }
+#progressDialog QTextEdit {
+    background-color: #11111b; color: #A6E3A1; border: 1px solid #313244;
+    border-radius: 8px; font-family: 'Consolas', monospace; font-size: 12px; padding: 8px;
+}
+#progressDialog QPushButton {
+    background-color: #F38BA8; color: #1e1e2e; border-radius: 6px;
+    padding: 8px 20px; font-weight: bold; border: none;
+}
+"""
 
 
 # ─── Analysis Settings Dialog ──────────────────────────────────────────────────
@@ -211,21 +676,7 @@ class AnalysisDialog(QtWidgets.QDialog):
         super().__init__(parent)
         self.setWindowTitle("Run Sports2D Analysis")
         self.setMinimumWidth(450)
-        self.setStyleSheet("""
-            QDialog { background-color: #1e1e2e; }
-            QLabel { color: #cdd6f4; font-size: 13px; }
-            QLineEdit, QSpinBox, QDoubleSpinBox { 
-                background-color: #313244; color: #cdd6f4; border: 1px solid #45475a; 
-                border-radius: 6px; padding: 8px; font-size: 13px; 
-            }
-            QPushButton { 
-                background-color: #4CAF50; color: white; border-radius: 6px; 
-                padding: 10px 20px; font-weight: bold; font-size: 14px; border: none;
-            }
-            QPushButton:hover { background-color: #66BB6A; }
-            QPushButton#cancelBtn { background-color: #45475a; }
-            QPushButton#cancelBtn:hover { background-color: #585b70; }
-        """)
+        self.setObjectName("analysisDialog")
 
         layout = QtWidgets.QVBoxLayout(self)
         layout.setSpacing(12)
@@ -292,18 +743,7 @@ class ProgressDialog(QtWidgets.QDialog):
         super().__init__(parent)
         self.setWindowTitle("Sports2D Analysis Running...")
         self.setMinimumSize(600, 400)
-        self.setStyleSheet("""
-            QDialog { background-color: #1e1e2e; }
-            QLabel { color: #cdd6f4; }
-            QTextEdit { 
-                background-color: #11111b; color: #A6E3A1; border: 1px solid #313244; 
-                border-radius: 8px; font-family: 'Consolas', monospace; font-size: 12px; padding: 8px;
-            }
-            QPushButton { 
-                background-color: #F38BA8; color: #1e1e2e; border-radius: 6px; 
-                padding: 8px 20px; font-weight: bold; border: none; 
-            }
-        """)
+        self.setObjectName("progressDialog")
 
         layout = QtWidgets.QVBoxLayout(self)
         self.status_lbl = QtWidgets.QLabel("⏳ Starting analysis...")
@@ -348,6 +788,9 @@ class Sports2DApp(QtWidgets.QMainWindow):
         ('LAnkle', 'LHeel'), ('LAnkle', 'LBigToe'), ('LAnkle', 'LSmallToe'),
     ]
 
+    # The graph time cursors are refreshed at ~15 Hz while playing, not per frame
+    CURSOR_INTERVAL_MS = 66
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Sports2D Advanced Motion Analysis")
@@ -361,8 +804,16 @@ class Sports2DApp(QtWidgets.QMainWindow):
         self.fps = 30.0
         self.video_path = None
         self.cap = None
+        self._last_decoded_frame = None  # Frame index self.cap last returned, None if unknown
+        self._frame_buf_idx = None  # Frame held undecorated in _frame_buf
         self.timer = QtCore.QTimer()
         self.timer.timeout.connect(self._advance_frame)
+        self._decoder = None
+        self._cursor_time = None
+        self._cursor_timer = QtCore.QTimer()
+        self._cursor_timer.setSingleShot(True)
+        self._cursor_timer.setInterval(self.CURSOR_INTERVAL_MS)
+        self._cursor_timer.timeout.connect(self._move_cursors)
         self.selected_joint = None
 
         # Calibration
@@ -397,14 +848,39 @@ class Sports2DApp(QtWidgets.QMainWindow):
         self._cache_ang_vel = None
         self._cache_ang_acc = None
         self._cache_angle_name = None
+        # Selected joint's (and Hip's) (n_frames, 2) coordinate columns and the
+        # (widget, series, format, fallback) rows shown by _update_stats
+        self._sel_coords = None
+        self._hip_coords = None
+        self._stat_series = []
+
+        # Per-marker kinematics in px, keyed by relative mode (see _marker_kinematics)
+        self._kin_cache = {}
+        # (n_bones, 2) marker indices of the SKELETON_CONNECTIONS present in the TRC
+        self._bone_idx = np.empty((0, 2), dtype=np.int32)
 
         self.scale_factor = 1.0
         self.offset_x = 0
         self.offset_y = 0
         self.v_lines = []
+        # Graph curves by series name, see _update_all_graphs
+        self._curves = {}
+
+        # Display buffer reused across frames; the QImage built on it must not outlive it
+        self._rgb_buf = None
+        # Last displayed pixmap, keyed by everything that changes its pixels (_pixmap_key)
+        self._pix_cache_key = None
+        self._pix_cache = None
+        # Decode target of the GUI capture; holds frame _frame_buf_idx undecorated
+        self._frame_buf = None
+        # Overlays are drawn on a copy, so redrawing the same frame skips the decoder
+        self._draw_buf = None
+
+        # Rendered once; qta.icon re-renders the glyph on every call
+        self._icon_play = qta.icon('fa5s.play', color='white')
+        self._icon_pause = qta.icon('fa5s.pause', color='white')
 
         self._build_ui()
-        self._apply_styles()
 
     # ── UI ──────────────────────────────────────────────────────────────────
 
@@ -437,14 +913,14 @@ class Sports2DApp(QtWidgets.QMainWindow):
         pb.setObjectName("controlBar")
         pb_lay = QtWidgets.QHBoxLayout(pb)
         pb_lay.setContentsMargins(8, 4, 8, 4)
-        self.play_btn = QtWidgets.QPushButton(qta.icon('fa5s.play', color='white'), "")
+        self.play_btn = QtWidgets.QPushButton(self._icon_play, "")
         self.play_btn.setFixedSize(40, 40)
         self.play_btn.setCursor(QtCore.Qt.PointingHandCursor)
         self.play_btn.clicked.connect(self._toggle_play)
         self.slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
         self.slider.setCursor(QtCore.Qt.PointingHandCursor)
         self.slider.sliderMoved.connect(self._seek)
-        self.slider.sliderPressed.connect(lambda: self.timer.stop())
+        self.slider.sliderPressed.connect(self._stop_playback)
         self.time_lbl = QtWidgets.QLabel("0.00 / 0.00")
         self.time_lbl.setFixedWidth(110)
         self.time_lbl.setAlignment(QtCore.Qt.AlignCenter)
@@ -540,6 +1016,8 @@ class Sports2DApp(QtWidgets.QMainWindow):
         self.stat_ang_vel = self._make_stat_row(dc_lay, self.stat_angvel_label)
         self.stat_angacc_label = QtWidgets.QLabel("Angular Accel (deg/s²):")
         self.stat_ang_acc = self._make_stat_row(dc_lay, self.stat_angacc_label)
+        self._stat_widgets = [self.stat_pos, self.stat_lin_vel, self.stat_lin_acc,
+                              self.stat_angle, self.stat_ang_vel, self.stat_ang_acc]
         right.addWidget(data_card)
 
         # Trajectory buttons
@@ -643,6 +1121,9 @@ class Sports2DApp(QtWidgets.QMainWindow):
         legend = g.plotItem.legend
         if legend:
             legend.setLabelTextColor(text_color)
+            # Existing labels only pick up the new color when their text is set again
+            for _, label in legend.items:
+                label.setText(label.text)
             if not self.graph_dark_mode:
                 # Add a subtle background to light mode legend for readability
                 legend.setBrush(pg.mkBrush(255, 255, 255, 200))
@@ -651,44 +1132,11 @@ class Sports2DApp(QtWidgets.QMainWindow):
                 legend.setBrush(pg.mkBrush(24, 24, 37, 200))
                 legend.setPen(pg.mkPen('#313244'))
 
-        g.setMinimumHeight(160)
+        # Only draw what is on screen, decimated to the pixel width (peak keeps min/max spikes)
+        g.setDownsampling(auto=True, mode='peak')
+        g.setClipToView(True)
 
-    def _apply_styles(self):
-        self.setStyleSheet("""
-        QMainWindow { background-color: #11111b; }
-        QWidget { color: #cdd6f4; font-family: 'Inter', 'Segoe UI', Arial; font-size: 13px; }
-        #videoFrame { background-color: #181825; border-radius: 10px; border: 1px solid #313244; }
-        #controlBar { background-color: #181825; border-radius: 8px; border: 1px solid #313244; }
-        QPushButton { background-color: #313244; border-radius: 6px; padding: 8px 16px; color: white; border: none; }
-        QPushButton:hover { background-color: #45475a; }
-        QPushButton:pressed { background-color: #585b70; }
-        #loadBtn { background-color: #45475a; padding: 10px 16px; }
-        #loadBtn:hover { background-color: #585b70; }
-        #analyzeBtn { background-color: #A6E3A1; color: #1e1e2e; font-weight: bold; padding: 10px 20px; }
-        #analyzeBtn:hover { background-color: #94E298; }
-        #calBtn { background-color: #F9E2AF; color: #1e1e2e; font-weight: bold; padding: 10px 16px; }
-        #calBtn:hover { background-color: #FAD87D; }
-        #exportGraphBtn { background-color: #CBA6F7; color: #1e1e2e; font-weight: bold; padding: 10px 16px; }
-        #exportGraphBtn:hover { background-color: #D4B8FA; }
-        #exportCsvBtn { background-color: #89B4FA; color: #1e1e2e; font-weight: bold; padding: 10px 16px; }
-        #exportCsvBtn:hover { background-color: #9CC3FB; }
-        #selHeader { color: #89B4FA; font-size: 16px; font-weight: bold; border: none; }
-        #dataCard { background-color: #181825; border-radius: 10px; border: 1px solid #313244; padding: 12px; }
-        #coordToggleBtn { background-color: #45475a; border-radius: 6px; padding: 10px; color: #cdd6f4; border: none; font-weight: bold; }
-        #coordToggleBtn:hover { background-color: #585b70; }
-        #trajBtn { background-color: #45475a; border-radius: 6px; padding: 10px; color: #cdd6f4; border: none; }
-        #trajBtn:hover { background-color: #585b70; }
-        #relTrajBtn { background-color: #45475a; border-radius: 6px; padding: 10px; color: #cdd6f4; border: none; }
-        #relTrajBtn:hover { background-color: #585b70; }
-        #graphThemeBtn { background-color: #45475a; border-radius: 6px; padding: 10px; color: #cdd6f4; border: none; font-weight: bold; }
-        #graphThemeBtn:hover { background-color: #585b70; }
-        #graphScroll { border: none; background: transparent; }
-        QScrollBar:vertical { background: #181825; width: 8px; }
-        QScrollBar::handle:vertical { background: #45475a; border-radius: 4px; }
-        QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { height: 0; }
-        QSlider::groove:horizontal { border: none; height: 6px; background: #313244; border-radius: 3px; }
-        QSlider::handle:horizontal { background: #4CAF50; border: none; width: 16px; height: 16px; margin: -5px 0; border-radius: 8px; }
-        """)
+        g.setMinimumHeight(160)
 
     def _update_unit_labels(self):
         u = self.unit_name
@@ -749,7 +1197,7 @@ class Sports2DApp(QtWidgets.QMainWindow):
         if not self.cap:
             QtWidgets.QMessageBox.warning(self, "No Video", "Load a video first.")
             return
-        self.timer.stop()
+        self._stop_playback()
         self.video_label.draw_mode = True
         self.video_label.clear_cal_line()
         self.status_lbl.setText("CALIBRATE: Draw a line on the video, then enter its real length.")
@@ -760,7 +1208,7 @@ class Sports2DApp(QtWidgets.QMainWindow):
         vy1 = (p1.y() - self.offset_y) / self.scale_factor
         vx2 = (p2.x() - self.offset_x) / self.scale_factor
         vy2 = (p2.y() - self.offset_y) / self.scale_factor
-        px_dist = np.sqrt((vx2 - vx1)**2 + (vy2 - vy1)**2)
+        px_dist = math.hypot(vx2 - vx1, vy2 - vy1)
 
         if px_dist < 5:
             self.status_lbl.setText("Line too short. Try again.")
@@ -879,14 +1327,19 @@ class Sports2DApp(QtWidgets.QMainWindow):
             self._load_video_from_path(path)
 
     def _load_video_from_path(self, path):
+        self._stop_playback()
         self.video_path = path
-        self.cap = cv2.VideoCapture(path)
+        self.cap = open_capture(path)
+        self._last_decoded_frame = -1
         self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
         self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
         self.slider.setMaximum(self.total_frames - 1)
         self.trc_data = None
         self.mot_data = None
         self.selected_joint = None
+        self._sel_coords = self._hip_coords = None
+        self._kin_cache = {}
+        self._pix_cache_key = self._pix_cache = self._frame_buf = self._frame_buf_idx = None
         self.video_label.clear_cal_line()
 
         base = os.path.splitext(os.path.basename(path))[0]
@@ -899,6 +1352,11 @@ class Sports2DApp(QtWidgets.QMainWindow):
                 self.trc_data = Sports2DLoader.load_trc(trc)
             if os.path.exists(mot):
                 self.mot_data = Sports2DLoader.load_mot(mot)
+            if self.trc_data:
+                mi = self.trc_data['joint_idx']
+                self._bone_idx = np.array([[mi[a], mi[b]] for a, b in self.SKELETON_CONNECTIONS
+                                           if a in mi and b in mi], dtype=np.int32).reshape(-1, 2)
+                self._marker_kinematics()
             self.status_lbl.setText(f"Loaded: {os.path.basename(analysis)}")
             self.status_lbl.setStyleSheet("color: #A6E3A1; font-size: 12px;")
         else:
@@ -912,32 +1370,62 @@ class Sports2DApp(QtWidgets.QMainWindow):
         if not self.cap or idx < 0 or idx >= self.total_frames:
             return
         self.current_frame = idx
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
-        ret, frame = self.cap.read()
-        if not ret:
+        playing = self.timer.isActive()
+        if playing:
+            # Take the capture back; frames already queued were drawn for the old
+            # position or view options
+            self._stop_decoder()
+        elif self._pixmap_key(idx) == self._pix_cache_key:
+            # Same pixels as on screen (e.g. after calibrating): only the readouts change
+            self.video_label.setPixmap(self._pix_cache)
+            self._update_frame_info(idx)
             return
-
+        if idx != self._frame_buf_idx:
+            ret, frame = read_frame(self.cap, self._last_decoded_frame, idx, self._frame_buf)
+            self._last_decoded_frame = self._frame_buf_idx = idx if ret else None
+            if not ret:
+                if playing:
+                    self._start_decoder(idx + 1)
+                return
+            self._frame_buf = frame
+        if self._draw_buf is None or self._draw_buf.shape != self._frame_buf.shape:
+            self._draw_buf = np.empty_like(self._frame_buf)
+        np.copyto(self._draw_buf, self._frame_buf)
+        self._show_frame(self._draw_buf, idx)
+        if playing:
+            self._start_decoder(idx + 1)
+
+    def _pixmap_key(self, idx):
+        return (idx, self.show_trajectory, self.show_relative_trajectory, self.selected_joint,
+                self.video_label.width(), self.video_label.height())
+
+    def _show_frame(self, frame, idx):
+        self.current_frame = idx
         frame = self._draw_overlays(frame, idx)
 
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb.shape
+        h, w = frame.shape[:2]
+        sw, sh = self._fit_frame(w, h)
+        if self._rgb_buf is None or self._rgb_buf.shape[:2] != (sh, sw):
+            self._rgb_buf = np.empty((sh, sw, 3), dtype=np.uint8)
+        rgb = frame_to_rgb(frame, (sw, sh), out=self._rgb_buf, fast=self.timer.isActive())
+        qimg = QtGui.QImage(rgb.data, sw, sh, 3 * sw, QtGui.QImage.Format_RGB888)
+        self._pix_cache = QtGui.QPixmap.fromImage(qimg)
+        self._pix_cache_key = self._pixmap_key(idx)
+        self.video_label.setPixmap(self._pix_cache)
+        self._update_frame_info(idx)
+
+    def _fit_frame(self, w, h):
+        """Display size of a w x h frame in the video label; also updates the click mapping."""
         lw, lh = self.video_label.width(), self.video_label.height()
         if lw <= 0 or lh <= 0:
             lw, lh = 750, 480
-        ia = w / h
-        la = lw / lh
-        if ia > la:
-            sw, sh = lw, int(lw / ia)
-        else:
-            sh, sw = lh, int(lh * ia)
+        sw, sh = fit_size(w, h, lw, lh)
         self.scale_factor = sw / w
         self.offset_x = (lw - sw) // 2
         self.offset_y = (lh - sh) // 2
+        return sw, sh
 
-        qimg = QtGui.QImage(rgb.data, w, h, ch * w, QtGui.QImage.Format_RGB888)
-        pix = QtGui.QPixmap.fromImage(qimg)
-        self.video_label.setPixmap(pix.scaled(self.video_label.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation))
-
+    def _update_frame_info(self, idx):
         self.slider.blockSignals(True)
         self.slider.setValue(idx)
         self.slider.blockSignals(False)
@@ -946,81 +1434,30 @@ class Sports2DApp(QtWidgets.QMainWindow):
         self.time_lbl.setText(f"{ct:.2f} / {tt:.2f}")
 
         if self.trc_data and idx < len(self.trc_data['time']):
-            tv = self.trc_data['time'][idx]
-            for vl in self.v_lines:
-                vl.setValue(tv)
+            self._cursor_time = self.trc_data['time'][idx]
+            if not self.timer.isActive():
+                self._move_cursors()
+            elif not self._cursor_timer.isActive():
+                self._cursor_timer.start()
         self._update_stats(idx)
 
-    def _draw_overlays(self, frame, idx):
+    def _move_cursors(self):
+        for vl in self.v_lines:
+            vl.setValue(self._cursor_time)
+
+    def _overlay_state(self):
+        """Snapshot of everything draw_overlays reads."""
         if not self.trc_data:
-            return frame
-        markers = self.trc_data['markers']
-        CLR_BONE = (180, 180, 180)
-        CLR_DOT = (255, 255, 255)
-        CLR_SEL = (80, 255, 80)
+            return None
+        return {'coords': self.trc_data['coords'], 'coords_i32': self.trc_data['coords_i32'],
+                'joint_idx': self.trc_data['joint_idx'],
+                'bone_idx': self._bone_idx, 'selected': self.selected_joint,
+                'show_trajectory': self.show_trajectory,
+                'show_relative_trajectory': self.show_relative_trajectory,
+                'angle': self._cache_angle}
 
-        # Trajectory
-        if self.selected_joint and self.selected_joint in markers:
-            c = markers[self.selected_joint]
-            if self.show_trajectory:
-                trail_len = min(60, idx)
-                for i in range(max(0, idx - trail_len), idx):
-                    if i < len(c['x']) and i + 1 < len(c['x']):
-                        x1, y1 = c['x'][i], c['y'][i]
-                        x2, y2 = c['x'][i+1], c['y'][i+1]
-                        if x1 > 0 and x2 > 0 and not (np.isnan(x1) or np.isnan(x2)):
-                            alpha = int(255 * (i - (idx - trail_len)) / max(trail_len, 1))
-                            clr = (min(255, alpha), 200, 80)
-                            cv2.line(frame, (int(x1), int(y1)), (int(x2), int(y2)), clr, 2, cv2.LINE_AA)
-
-            if self.show_relative_trajectory and 'Hip' in markers:
-                if idx < len(markers['Hip']['x']):
-                    hip_x, hip_y = markers['Hip']['x'][idx], markers['Hip']['y'][idx]
-                    if hip_x > 0 and not np.isnan(hip_x):
-                        trail_len = min(60, idx)
-                        for i in range(max(0, idx - trail_len), idx):
-                            if i >= len(c['x']) or i+1 >= len(c['x']) or i >= len(markers['Hip']['x']):
-                                continue
-                            hx_i, hy_i = markers['Hip']['x'][i], markers['Hip']['y'][i]
-                            if hx_i <= 0 or np.isnan(hx_i):
-                                continue
-                            rx1 = c['x'][i] - hx_i + hip_x
-                            ry1 = c['y'][i] - hy_i + hip_y
-                            j = min(i+1, len(c['x'])-1)
-                            hx_j = markers['Hip']['x'][min(j, len(markers['Hip']['x'])-1)]
-                            hy_j = markers['Hip']['y'][min(j, len(markers['Hip']['y'])-1)]
-                            rx2 = c['x'][j] - hx_j + hip_x
-                            ry2 = c['y'][j] - hy_j + hip_y
-                            cv2.line(frame, (int(rx1), int(ry1)), (int(rx2), int(ry2)),
-                                     (80, 200, 255), 2, cv2.LINE_AA)
-
-        # Skeleton
-        for a, b in self.SKELETON_CONNECTIONS:
-            if a in markers and b in markers:
-                if idx < len(markers[a]['x']) and idx < len(markers[b]['x']):
-                    x1, y1 = markers[a]['x'][idx], markers[a]['y'][idx]
-                    x2, y2 = markers[b]['x'][idx], markers[b]['y'][idx]
-                    if x1 > 0 and x2 > 0 and not (np.isnan(x1) or np.isnan(x2)):
-                        cv2.line(frame, (int(x1), int(y1)), (int(x2), int(y2)), CLR_BONE, 2, cv2.LINE_AA)
-
-        # Dots & labels
-        for name, c in markers.items():
-            if idx < len(c['x']):
-                x, y = c['x'][idx], c['y'][idx]
-                if x <= 0 or np.isnan(x):
-                    continue
-                if name == self.selected_joint:
-                    cv2.circle(frame, (int(x), int(y)), 9, CLR_SEL, -1, cv2.LINE_AA)
-                    cv2.putText(frame, name, (int(x)+14, int(y)-14),
-                                cv2.FONT_HERSHEY_DUPLEX, 0.65, CLR_SEL, 1, cv2.LINE_AA)
-                    if self._cache_angle is not None and idx < len(self._cache_angle):
-                        ang = self._cache_angle[idx]
-                        if not np.isnan(ang):
-                            cv2.putText(frame, f"{ang:.1f} deg", (int(x)+14, int(y)+18),
-                                        cv2.FONT_HERSHEY_SIMPLEX, 0.55, (80, 200, 255), 1, cv2.LINE_AA)
-                else:
-                    cv2.circle(frame, (int(x), int(y)), 4, CLR_DOT, -1, cv2.LINE_AA)
-        return frame
+    def _draw_overlays(self, frame, idx):
+        return draw_overlays(frame, idx, self._overlay_state())
 
     # ── Click to select ─────────────────────────────────────────────────────
 
@@ -1029,16 +1466,15 @@ class Sports2DApp(QtWidgets.QMainWindow):
             return
         vx = (pos.x() - self.offset_x) / self.scale_factor
         vy = (pos.y() - self.offset_y) / self.scale_factor
-        best, best_d = None, 50
-        for name, c in self.trc_data['markers'].items():
-            if self.current_frame < len(c['x']):
-                mx, my = c['x'][self.current_frame], c['y'][self.current_frame]
-                if mx <= 0 or np.isnan(mx):
-                    continue
-                d = np.hypot(mx - vx, my - vy)
-                if d < best_d:
-                    best_d = d
-                    best = name
+        coords = self.trc_data['coords']
+        best = None
+        if self.current_frame < len(coords) and coords.shape[1]:
+            pts = coords[self.current_frame]
+            d = np.hypot(pts[:, 0] - vx, pts[:, 1] - vy)
+            d[~(pts[:, 0] > 0) | np.isnan(d)] = np.inf  # drops NaN joints, including a NaN y
+            j = int(d.argmin())
+            if d[j] < 50:
+                best = self.trc_data['marker_list'][j]
         if best:
             self.selected_joint = best
             self.sel_header.setText(f"Selected: {best}")
@@ -1048,42 +1484,42 @@ class Sports2DApp(QtWidgets.QMainWindow):
 
     # ── Kinematics ──────────────────────────────────────────────────────────
 
+    def _marker_kinematics(self):
+        """Kinematics of every marker for the current coordinate mode, computed once per mode."""
+        coords = self.trc_data['coords']
+        mi = self.trc_data['joint_idx']
+        relative = self.use_relative_coords and 'Hip' in mi
+        if relative not in self._kin_cache:
+            # Transposed copies: the time derivatives want each joint contiguous
+            X = coords[:, :, 0].T.copy()
+            Y = coords[:, :, 1].T.copy()
+            # Relative mode: subtract Hip position so Hip becomes (0,0)
+            if relative:
+                X -= coords[:, mi['Hip'], 0]
+                Y -= coords[:, mi['Hip'], 1]
+            self._kin_cache[relative] = marker_kinematics(X, Y, 1.0 / self.trc_data['data_rate'])
+        return self._kin_cache[relative]
+
     def _compute_kinematics(self):
         if not self.selected_joint or not self.trc_data:
             return
-        c = self.trc_data['markers'][self.selected_joint]
         dt = 1.0 / self.trc_data['data_rate']
         t = self.trc_data['time']
         self._cache_time = t
 
         s = 1.0 / self.px_per_unit if self.px_per_unit else 1.0
 
-        # Get raw x/y arrays
-        raw_x = c['x'].copy()
-        raw_y = c['y'].copy()
-
-        # Relative mode: subtract Hip position so Hip becomes (0,0)
-        if self.use_relative_coords and 'Hip' in self.trc_data['markers']:
-            hip = self.trc_data['markers']['Hip']
-            n = min(len(raw_x), len(hip['x']))
-            raw_x[:n] = raw_x[:n] - hip['x'][:n]
-            raw_y[:n] = raw_y[:n] - hip['y'][:n]
-
-        # Cache scaled positions for the position graph
-        self._cache_pos_x = raw_x * s
-        self._cache_pos_y = raw_y * s
-
-        vx = np.gradient(raw_x * s, dt)
-        vy = np.gradient(raw_y * s, dt)
-        self._cache_vx = smooth(vx)
-        self._cache_vy = smooth(vy)
-        self._cache_vtotal = smooth(np.sqrt(vx**2 + vy**2))
-
-        ax = np.gradient(self._cache_vx, dt)
-        ay = np.gradient(self._cache_vy, dt)
-        self._cache_ax = smooth(ax)
-        self._cache_ay = smooth(ay)
-        self._cache_atotal = smooth(np.sqrt(ax**2 + ay**2))
+        # Everything is linear in the pixel scale, so the px rows only need scaling
+        kin = self._marker_kinematics()
+        j = self.trc_data['joint_idx'][self.selected_joint]
+        self._cache_pos_x = kin['x'][j] * s
+        self._cache_pos_y = kin['y'][j] * s
+        self._cache_vx = kin['vx'][j] * s
+        self._cache_vy = kin['vy'][j] * s
+        self._cache_vtotal = kin['vtotal'][j] * s
+        self._cache_ax = kin['ax'][j] * s
+        self._cache_ay = kin['ay'][j] * s
+        self._cache_atotal = kin['atotal'][j] * s
 
         angle_col = MARKER_TO_ANGLE.get(self.selected_joint)
         if angle_col and self.mot_data and angle_col in self.mot_data['angles']:
@@ -1099,10 +1535,10 @@ class Sports2DApp(QtWidgets.QMainWindow):
             self._cache_angle = smooth(unwrapped_deg)
             self._cache_angle_180 = 180.0 - self._cache_angle
             
-            ang_vel = np.gradient(self._cache_angle, dt)
+            ang_vel = time_gradient(self._cache_angle, dt)
             self._cache_ang_vel = smooth(ang_vel)
             
-            ang_acc = np.gradient(self._cache_ang_vel, dt)
+            ang_acc = time_gradient(self._cache_ang_vel, dt)
             self._cache_ang_acc = smooth(ang_acc)
         else:
             self._cache_angle_name = None
@@ -1111,6 +1547,19 @@ class Sports2DApp(QtWidgets.QMainWindow):
             self._cache_ang_vel = None
             self._cache_ang_acc = None
 
+        coords = self.trc_data['coords']
+        hip = self.trc_data['joint_idx'].get('Hip')
+        self._sel_coords = coords[:, j]
+        self._hip_coords = coords[:, hip] if hip is not None else None
+        # Linear stats keep their last text when missing, angular ones show a dash
+        self._stat_series = [
+            (self.stat_lin_vel, self._cache_vtotal, '.4f', None),
+            (self.stat_lin_acc, self._cache_atotal, '.4f', None),
+            (self.stat_angle, self._cache_angle, '.2f', "—"),
+            (self.stat_ang_vel, self._cache_ang_vel, '.2f', "—"),
+            (self.stat_ang_acc, self._cache_ang_acc, '.2f', "—"),
+        ]
+
     # ── Update graphs ───────────────────────────────────────────────────────
 
     def _update_all_graphs(self):
@@ -1136,39 +1585,44 @@ class Sports2DApp(QtWidgets.QMainWindow):
             c_angacc = {'color': '#AA8800', 'width': 2.5}
             c_180 = {'color': '#118877', 'width': 2.5}
 
-        # Clear all graphs and their legends
-        for g, vl in zip([self.graph_pos, self.graph_vel, self.graph_acc, self.graph_ang_vel, self.graph_ang_acc, self.graph_angle_180], self.v_lines):
-            g.clear()
-            if g.plotItem.legend:
-                g.plotItem.legend.clear()
-            g.addItem(vl)
-
-        # Position graph
-        if self._cache_pos_x is not None:
-            n = min(len(t), len(self._cache_pos_x))
-            self.graph_pos.plot(t[:n], self._cache_pos_x[:n], pen=pg.mkPen(**c_x), name="X")
-            self.graph_pos.plot(t[:n], self._cache_pos_y[:n], pen=pg.mkPen(**c_y), name="Y")
-
-        # Velocity graph
-        if self._cache_vx is not None:
-            n = min(len(t), len(self._cache_vx))
-            self.graph_vel.plot(t[:n], self._cache_vx[:n], pen=pg.mkPen(**c_x), name="Vx")
-            self.graph_vel.plot(t[:n], self._cache_vy[:n], pen=pg.mkPen(**c_y), name="Vy")
-            self.graph_vel.plot(t[:n], self._cache_vtotal[:n], pen=pg.mkPen(**c_total), name="Vtotal")
-
-        # Acceleration graph
-        if self._cache_ax is not None:
-            n = min(len(t), len(self._cache_ax))
-            self.graph_acc.plot(t[:n], self._cache_ax[:n], pen=pg.mkPen(**c_x), name="Ax")
-            self.graph_acc.plot(t[:n], self._cache_ay[:n], pen=pg.mkPen(**c_y), name="Ay")
-            self.graph_acc.plot(t[:n], self._cache_atotal[:n], pen=pg.mkPen(**c_atotal), name="Atotal")
+        # Curves are created on first use, so graphs show no legend entries until a
+        # joint is selected, and are refilled with setData afterwards
+        if not self._curves:
+            self._curves = {
+                'pos_x': self.graph_pos.plot(name="X", connect='finite'),
+                'pos_y': self.graph_pos.plot(name="Y", connect='finite'),
+                'vx': self.graph_vel.plot(name="Vx", connect='finite'),
+                'vy': self.graph_vel.plot(name="Vy", connect='finite'),
+                'vtotal': self.graph_vel.plot(name="Vtotal", connect='finite'),
+                'ax': self.graph_acc.plot(name="Ax", connect='finite'),
+                'ay': self.graph_acc.plot(name="Ay", connect='finite'),
+                'atotal': self.graph_acc.plot(name="Atotal", connect='finite'),
+                'ang_vel': self.graph_ang_vel.plot(connect='finite'),
+                'ang_acc': self.graph_ang_acc.plot(connect='finite'),
+                'angle_180': self.graph_angle_180.plot(connect='finite'),
+            }
+        series = [
+            ('pos_x', self._cache_pos_x, c_x), ('pos_y', self._cache_pos_y, c_y),
+            ('vx', self._cache_vx, c_x), ('vy', self._cache_vy, c_y),
+            ('vtotal', self._cache_vtotal, c_total),
+            ('ax', self._cache_ax, c_x), ('ay', self._cache_ay, c_y),
+            ('atotal', self._cache_atotal, c_atotal),
+            ('ang_vel', self._cache_ang_vel, c_angvel), ('ang_acc', self._cache_ang_acc, c_angacc),
+            ('angle_180', self._cache_angle_180, c_180),
+        ]
+        for key, y, pen in series:
+            curve = self._curves[key]
+            curve.setPen(pg.mkPen(**pen))
+            if y is None:
+                curve.setData([], [])
+            else:
+                n = min(len(t), len(y))
+                curve.setData(t[:n], y[:n])
 
         # Angular Velocity graph
         if self._cache_ang_vel is not None:
             label = self._cache_angle_name or "?"
             self.graph_ang_vel.setTitle(f"Angular Velocity: {label}")
-            n = min(len(t), len(self._cache_ang_vel))
-            self.graph_ang_vel.plot(t[:n], self._cache_ang_vel[:n], pen=pg.mkPen(**c_angvel))
         else:
             self.graph_ang_vel.setTitle("Angular Velocity (no angle data)")
 
@@ -1176,8 +1630,6 @@ class Sports2DApp(QtWidgets.QMainWindow):
         if self._cache_ang_acc is not None:
             label = self._cache_angle_name or "?"
             self.graph_ang_acc.setTitle(f"Angular Acceleration: {label}")
-            n = min(len(t), len(self._cache_ang_acc))
-            self.graph_ang_acc.plot(t[:n], self._cache_ang_acc[:n], pen=pg.mkPen(**c_angacc))
         else:
             self.graph_ang_acc.setTitle("Angular Acceleration (no angle data)")
 
@@ -1185,74 +1637,95 @@ class Sports2DApp(QtWidgets.QMainWindow):
         if self._cache_angle_180 is not None:
             label = self._cache_angle_name or "?"
             self.graph_angle_180.setTitle(f"Supplementary Angle (180 \u2212 \u03b8): {label}")
-            n = min(len(t), len(self._cache_angle_180))
-            self.graph_angle_180.plot(t[:n], self._cache_angle_180[:n], pen=pg.mkPen(**c_180))
         else:
             self.graph_angle_180.setTitle("Supplementary Angle 180 \u2212 \u03b8 (no angle data)")
 
     # ── Stats ───────────────────────────────────────────────────────────────
 
     def _update_stats(self, idx):
-        if not self.selected_joint or not self.trc_data:
-            return
-        c = self.trc_data['markers'].get(self.selected_joint)
-        if not c or idx >= len(c['x']):
+        c = self._sel_coords
+        if c is None or idx >= len(c):
             return
-        x, y = c['x'][idx], c['y'][idx]
-        if np.isnan(x):
-            for w in [self.stat_pos, self.stat_lin_vel, self.stat_lin_acc,
-                      self.stat_angle, self.stat_ang_vel, self.stat_ang_acc]:
+        x, y = c[idx]
+        if math.isnan(x):
+            for w in self._stat_widgets:
                 w.setText("N/A")
             return
 
         # In relative mode, subtract hip position
-        if self.use_relative_coords and 'Hip' in self.trc_data['markers']:
-            hip = self.trc_data['markers']['Hip']
-            if idx < len(hip['x']) and not np.isnan(hip['x'][idx]):
-                x = x - hip['x'][idx]
-                y = y - hip['y'][idx]
+        if self.use_relative_coords and self._hip_coords is not None:
+            hip_x, hip_y = self._hip_coords[idx]
+            if not math.isnan(hip_x):
+                x = x - hip_x
+                y = y - hip_y
         sx, sy = self._scale_val(x), self._scale_val(y)
         self.stat_pos.setText(f"({sx:.4f}, {sy:.4f})")
 
-        if self._cache_vtotal is not None and idx < len(self._cache_vtotal):
-            self.stat_lin_vel.setText(f"{self._cache_vtotal[idx]:.4f}")
-        if self._cache_atotal is not None and idx < len(self._cache_atotal):
-            self.stat_lin_acc.setText(f"{self._cache_atotal[idx]:.4f}")
-        if self._cache_angle is not None and idx < len(self._cache_angle):
-            self.stat_angle.setText(f"{self._cache_angle[idx]:.2f}")
-        else:
-            self.stat_angle.setText("—")
-        if self._cache_ang_vel is not None and idx < len(self._cache_ang_vel):
-            self.stat_ang_vel.setText(f"{self._cache_ang_vel[idx]:.2f}")
-        else:
-            self.stat_ang_vel.setText("—")
-        if self._cache_ang_acc is not None and idx < len(self._cache_ang_acc):
-            self.stat_ang_acc.setText(f"{self._cache_ang_acc[idx]:.2f}")
-        else:
-            self.stat_ang_acc.setText("—")
+        for w, series, fmt, missing in self._stat_series:
+            if series is not None and idx < len(series):
+                w.setText(format(series[idx], fmt))
+            elif missing is not None:
+                w.setText(missing)
 
     # ── Playback ────────────────────────────────────────────────────────────
 
     def _toggle_play(self):
         if self.timer.isActive():
-            self.timer.stop()
-            self.play_btn.setIcon(qta.icon('fa5s.play', color='white'))
+            self._stop_playback()
         else:
-            if not self.cap:
+            if not self.cap or self._frame_buf is None:
                 return
+            self._start_decoder(self.current_frame + 1)
             self.timer.start(int(1000 / self.fps))
-            self.play_btn.setIcon(qta.icon('fa5s.pause', color='white'))
+            self.play_btn.setIcon(self._icon_pause)
+
+    def _start_decoder(self, start):
+        """(Re)start the playback decoder at frame `start` with the current view options."""
+        self._stop_decoder()
+        h, w = self._frame_buf.shape[:2]
+        # The decoder continues from wherever the GUI left self.cap, usually the frame before
+        self._decoder = FrameDecoder(self.cap, self._last_decoded_frame, start,
+                                     self._fit_frame(w, h), self._overlay_state())
+        self._decoder.start()
+
+    def _stop_decoder(self):
+        """Stop the playback decoder and take back the capture along with its position."""
+        if self._decoder:
+            self._decoder.stop()
+            self._last_decoded_frame = self._decoder.last
+            self._decoder = None
+
+    def _stop_playback(self):
+        self.timer.stop()
+        self._stop_decoder()
+        self.play_btn.setIcon(self._icon_play)
 
     def _advance_frame(self):
-        if self.current_frame < self.total_frames - 1:
-            self._set_frame(self.current_frame + 1)
-        else:
-            self.timer.stop()
-            self.play_btn.setIcon(qta.icon('fa5s.play', color='white'))
+        if self.current_frame >= self.total_frames - 1:
+            self._stop_playback()
+            return
+        h, w = self._frame_buf.shape[:2]
+        if self._fit_frame(w, h) != self._decoder.size:
+            # The label was resized; queued images have the old size
+            self._start_decoder(self.current_frame + 1)
+        # Check before popping: once the thread has finished, an empty buffer means end of stream
+        done = self._decoder.isFinished()
+        item = self._decoder.pop()
+        if item:
+            idx, qimg = item
+            self.current_frame = idx
+            self.video_label.setPixmap(QtGui.QPixmap.fromImage(qimg))
+            self._update_frame_info(idx)
+        elif done:
+            self._stop_playback()
 
     def _seek(self, val):
         self._set_frame(val)
 
+    def closeEvent(self, event):
+        self._stop_playback()
+        super().closeEvent(event)
+
     # ── Export ───────────────────────────────────────────────────────────────
 
     def _export_graphs(self):
@@ -1271,6 +1744,7 @@ class Sports2DApp(QtWidgets.QMainWindow):
             'angular_acceleration': self.graph_ang_acc,
             'supplementary_angle_180': self.graph_angle_180,
         }
+        import pyqtgraph.exporters
         saved = 0
         for name, graph in graphs.items():
             try:
@@ -1321,6 +1795,7 @@ class Sports2DApp(QtWidgets.QMainWindow):
         if self._cache_ang_acc is not None:
             ln = min(n, len(self._cache_ang_acc))
             data['AngAcc_deg/s2'] = self._cache_ang_acc[:ln]
+        import pandas as pd
         df = pd.DataFrame(data)
         df.to_csv(path, index=False)
         self.status_lbl.setText(f"CSV saved: {os.path.basename(path)}")
@@ -1429,6 +1904,8 @@ class Sports2DApp(QtWidgets.QMainWindow):
 if __name__ == "__main__":
     app = QtWidgets.QApplication(sys.argv)
     app.setStyle("Fusion")
+    app.setStyleSheet(_APP_QSS + _ANALYSIS_QSS + _PROGRESS_QSS)
+    cv2.ocl.setUseOpenCL(cv2.ocl.haveOpenCL())
     font = QtGui.QFont("Inter", 10)
     app.setFont(font)
     w = Sports2DApp()